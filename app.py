@@ -1,5 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from st_aggrid import AgGrid, GridOptionsBuilder
 
 #Configuration of Page Layout
@@ -17,29 +22,100 @@ SCHEMA = {
     "refer": ['expid', 'refid', 'ryear', 'rauthor', 'rtitle', 'rpublisher']
 }
 
-#Def for Loading the Data
+#Def for Loading One Table
+#Per-table caching means a page only pays for the tables it actually renders:
+#the grid needs just exped, the other three load on the first row selection.
 @st.cache_data
-def load_data():
-    data = {}
-    for file in SCHEMA.keys():
+def load_table(file):
+    try:
+        #Parquet cache (written by prepare_cache.py) is tried first, as it skips CSV parsing entirely.
         try:
+            df = pd.read_parquet(f"DataCSV/{file}.parquet")
+        except (FileNotFoundError, OSError):
             #Data is attempted to be read with utf-8 encoding first.
+            #The pyarrow engine parses with multiple threads, which is much faster on cold start.
             try:
-                df = pd.read_csv(f"DataCSV/{file}.csv", dtype=str, encoding='utf-8')
-            #If that fails, it falls back to latin1 encoding
-            except UnicodeDecodeError:
+                df = pd.read_csv(f"DataCSV/{file}.csv", dtype=str, encoding='utf-8', engine='pyarrow')
+            #If that fails, it falls back to latin1 encoding (single-threaded C engine)
+            except (UnicodeDecodeError, pa.lib.ArrowInvalid):
                 df = pd.read_csv(f"DataCSV/{file}.csv", dtype=str, encoding='latin1')
-            
-            #Ensures that required columns exist. If not it adds them with 'N/A' values.
-            for col in SCHEMA[file]:
-                if col not in df.columns:
-                    df[col] = 'N/A'
-            data[file] = df.fillna('N/A')
-            
-        except Exception as e:
-            st.error(f"Error loading {file}: {str(e)}")
-            data[file] = pd.DataFrame(columns=SCHEMA[file]).fillna('N/A')
-    return data
+
+        #Ensures that required columns exist (missing ones are added) and fills gaps with 'N/A',
+        #in a single allocation instead of one column insert at a time.
+        extra_cols = [col for col in df.columns if col not in SCHEMA[file]]
+        df = df.reindex(columns=SCHEMA[file] + extra_cols).fillna('N/A')
+
+        #IDs are normalized once here (stray whitespace/case removed), so the
+        #lookups between tables never need to re-normalize per click.
+        for col in ('expid', 'peakid'):
+            if col in df.columns:
+                df[col] = df[col].str.strip().str.upper()
+
+        #Columns used for filtering/joining repeat heavily, so store them as
+        #category dtype: filters then compare small integer codes instead of strings.
+        for col in ('expid', 'year', 'nation', 'peakid', 'host'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        #Lowercased copy of leaders, built once here so the search filter
+        #does not re-casefold the whole column on every keystroke.
+        if file == 'exped':
+            df['_leaders_lc'] = df['leaders'].str.lower()
+
+        #The peaks table is keyed by peakid, so its lookups become O(1)
+        #hash probes on the index instead of boolean scans.
+        if file == 'peaks':
+            df = df.set_index('peakid', drop=False)
+
+        #Members are keyed (non-uniquely) by expid; a sorted index turns the
+        #per-expedition selection into one indexed row+column take.
+        if file == 'members':
+            df = df.set_index('expid', drop=False).sort_index()
+        return df
+
+    except Exception as e:
+        st.error(f"Error loading {file}: {str(e)}")
+        #Empty frame with the schema's columns and the same dtypes as the
+        #success path, so downstream filters never hit a dtype mismatch.
+        empty = pd.DataFrame({col: pd.Series(dtype=str) for col in SCHEMA[file]})
+        for col in ('expid', 'year', 'nation', 'peakid', 'host'):
+            if col in empty.columns:
+                empty[col] = empty[col].astype('category')
+        #The leader search expects the helper column the success path adds
+        if file == 'exped':
+            empty['_leaders_lc'] = pd.Series(dtype=str)
+        return empty
+
+
+#Def for Building a Row Index on One Table
+#Maps each key (expid/peakid) to the row positions holding it, so a click is a
+#dict lookup + take instead of a full-table scan.
+@st.cache_data
+def table_index(file, col):
+    return load_table(file).groupby(col, sort=False, observed=True).indices
+
+
+#Def for the Case-Insensitive Leader Search
+#Works on the pre-lowercased _leaders_lc column, so only the needle is
+#casefolded here. Arrow's substring kernel is a plain C++ memmem scan,
+#so no regex is compiled or run per keystroke.
+def leaders_match(leaders_lc, search):
+    search = search.lower()
+    try:
+        return pc.match_substring(pa.array(leaders_lc), search).to_numpy(zero_copy_only=False)
+    #Falls back to a literal (non-regex) pandas match on any Arrow error
+    except pa.lib.ArrowInvalid:
+        return leaders_lc.str.contains(search, regex=False, na=False).to_numpy()
+
+
+#Def for the Sidebar Filter Options
+#Cached so the unique+sort work is not redone on every widget rerun. A
+#tuple is returned so the cached value is immutable and handed straight
+#to the widget, with no defensive copy per rerun.
+@st.cache_data
+def filter_options(file, col, reverse=False):
+    #The categories of a category column are already its unique values.
+    return tuple(load_table(file)[col].cat.categories.sort_values(ascending=not reverse))
 
 
 def main():
@@ -47,9 +123,8 @@ def main():
     st.title("Himalayan Expedition Data Explorer")
     st.markdown("Explore expedition data from the Himalayan Database")
 
-    #Load data
-    data = load_data()
-    exped, members, peaks, refer = data['exped'], data['members'], data['peaks'], data['refer']
+    #Load data (only the expedition table; the detail tables load on first selection)
+    exped = load_table('exped')
 
     # < SIDEBAR FILTERS >
     with st.sidebar:
@@ -58,11 +133,11 @@ def main():
         #Year Filter
         selected_years = st.multiselect(
             "Year",
-            options=sorted(exped['year'].unique(), reverse=True),
+            options=filter_options('exped', 'year', reverse=True),
         )
-        
+
         #Nation Filter
-        all_nations = sorted(exped['nation'].unique())
+        all_nations = filter_options('exped', 'nation')
         selected_nations = st.multiselect(
             "Nation",
             options=all_nations,
@@ -74,22 +149,33 @@ def main():
     # < MAIN EXPEDITION TABLE >
     st.header("🗂️ Expeditions")
     
-    # Applying filters
-    filtered_exped = exped.copy()
-    if selected_years:
-        filtered_exped = filtered_exped[filtered_exped['year'].isin(selected_years)]
-    if selected_nations:
-        filtered_exped = filtered_exped[filtered_exped['nation'].isin(selected_nations)]
-    if leader_search:
-        filtered_exped = filtered_exped[
-            filtered_exped['leaders'].str.contains(leader_search, case=False, na=False)
-        ]
+    # Applying filters as a single combined mask, so only one filtered frame is
+    # allocated. The default no-filter view takes the table as-is: everything
+    # downstream is read-only, so no copy (or mask) is needed at all.
+    if selected_years or selected_nations or leader_search:
+        mask = np.ones(len(exped), dtype=bool)
+        if selected_years:
+            mask &= exped['year'].isin(selected_years).to_numpy()
+        if selected_nations:
+            mask &= exped['nation'].isin(selected_nations).to_numpy()
+        if leader_search:
+            mask &= leaders_match(exped['_leaders_lc'], leader_search)
+        filtered_exped = exped[mask]
+    else:
+        filtered_exped = exped
 
     # Configuring the AgGrid
-    gb = GridOptionsBuilder.from_dataframe(filtered_exped[SCHEMA['exped'][:5]])
+    # Only the visible columns are sent to the browser; the full record is
+    # looked up again by expid when a row is selected.
+    grid_data = filtered_exped[SCHEMA['exped'][:6]]
+    gb = GridOptionsBuilder.from_dataframe(grid_data)
     gb.configure_selection('single')
+    #Paginate and keep row/column virtualization on, so the browser lays out
+    #only the rows in view instead of measuring all ~11k rows at once.
+    gb.configure_pagination(paginationAutoPageSize=True)
+    gb.configure_grid_options(rowBuffer=20, suppressColumnVirtualisation=False)
     grid_response = AgGrid(
-        filtered_exped,
+        grid_data,
         gridOptions=gb.build(),
         height=300,
         theme='streamlit',
@@ -114,26 +200,42 @@ def main():
     # < DETAILS SECTION >
     if selected_exp:
         exp_id = selected_exp['expid']
+
+        #The grid only carried the visible columns, so the remaining fields
+        #(sponsor, highpoint, peakid, ...) are fetched from the exped table here
+        selected_exp = exped.take(table_index('exped', 'expid').get(exp_id, [])).iloc[0]
+
+        #The detail tables are only loaded (and cached) once a row is selected.
+        #They are parsed in parallel: the pyarrow read path releases the GIL,
+        #so the wall time is close to the largest file rather than the sum.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            members, peaks, refer = executor.map(load_table, ('members', 'peaks', 'refer'))
         
         # 1. Expedition Details
         with st.expander(f"🧭 Expedition Details:", expanded=True):
-            cols = st.columns(3)        
-            cols[0].write(f"**Expedition ID:** {selected_exp['expid']}")
-            cols[1].write(f"**Year:** {selected_exp['year']}")
-            
-            cols = st.columns(3)
-            cols[0].write(f"**Host:** {selected_exp['host']}")
-            cols[1].write(f"**Leaders:** {selected_exp['leaders']}")
-            cols[2].write(f"**Nation:** {selected_exp['nation']}")
-
-            cols = st.columns(3)
-            cols[0].write(f"**Sponsor:** {selected_exp['sponsor']}")
-            cols[1].write(f"**Height:** {selected_exp['highpoint']} m")
-            cols[2].write(f"**Deaths:** {selected_exp['hdeaths']}")
+            #One markdown table is a single frontend message, instead of the
+            #previous three column grids with eight separate writes.
+            details = {
+                "Expedition ID": selected_exp['expid'],
+                "Year": selected_exp['year'],
+                "Host": selected_exp['host'],
+                "Leaders": selected_exp['leaders'],
+                "Nation": selected_exp['nation'],
+                "Sponsor": selected_exp['sponsor'],
+                "Height": f"{selected_exp['highpoint']} m",
+                "Deaths": selected_exp['hdeaths'],
+            }
+            st.markdown(
+                "| Field | Value |\n|---|---|\n"
+                + "".join(f"| **{field}** | {value} |\n" for field, value in details.items())
+            )
         
         # 2. Members Table
         with st.expander(f"🗣 Members", expanded=False):
-            member_data = members[members['expid'] == exp_id][SCHEMA['members'][1:]]
+            try:
+                member_data = members.loc[[exp_id], SCHEMA['members'][1:]]
+            except KeyError:
+                member_data = members.iloc[0:0, 1:len(SCHEMA['members'])]
             if not member_data.empty:
                 col1, col2 = st.columns(2)
                 with col1:
@@ -144,7 +246,10 @@ def main():
                 st.warning("No member records found")
 
         # 3. Peak Information
-        peak_data = peaks[peaks['peakid'] == selected_exp['peakid']]
+        try:
+            peak_data = peaks.loc[[selected_exp['peakid']]]
+        except KeyError:
+            peak_data = peaks.iloc[0:0]
         with st.expander("⛰️ Peak Details", expanded=False):
             if not peak_data.empty:
                 cols = st.columns(3)
@@ -159,7 +264,7 @@ def main():
                 st.warning("No peak data available")
 
         # 4. References
-        ref_data = refer[refer['expid'] == exp_id][SCHEMA['refer'][1:]]
+        ref_data = refer.take(table_index('refer', 'expid').get(exp_id, []))[SCHEMA['refer'][1:]]
         with st.expander("📚 References", expanded=False):
             if not ref_data.empty:
                 for _, row in ref_data.iterrows():
@@ -0,0 +1,23 @@
+import pandas as pd
+import pyarrow as pa
+
+#Tables to convert. Must match the files loaded by app.py.
+FILES = ["exped", "members", "peaks", "refer"]
+
+#Def for Converting the CSVs to Parquet
+#Run this once (python prepare_cache.py) so app.py can skip CSV parsing entirely.
+def prepare_cache():
+    for file in FILES:
+        #Data is attempted to be read with utf-8 encoding first.
+        try:
+            df = pd.read_csv(f"DataCSV/{file}.csv", dtype=str, encoding='utf-8', engine='pyarrow')
+        #If that fails, it falls back to latin1 encoding
+        except (UnicodeDecodeError, pa.lib.ArrowInvalid):
+            df = pd.read_csv(f"DataCSV/{file}.csv", dtype=str, encoding='latin1')
+
+        df.to_parquet(f"DataCSV/{file}.parquet", compression='snappy', index=False)
+        print(f"Wrote DataCSV/{file}.parquet ({len(df)} rows)")
+
+
+if __name__ == "__main__":
+    prepare_cache()